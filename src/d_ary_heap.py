@@ -0,0 +1,178 @@
+"""
+d-ary Heap
+----------
+
+A d-ary heap is a generalization of the binary heap in which each node has up
+to d children instead of 2. It is stored in an array in the same way, with an
+implicit pointer structure determined by array indices. For zero-based arrays,
+the children of the node at index i are at d*i+1, d*i+2, ..., d*i+d and its
+parent is at (i-1) // d. A binary heap is simply a d-ary heap with d=2.
+
+Formally, a d-ary heap is an array for which a[i] <= a[d*i+j] for all i and
+1 <= j <= d for zero-based arrays. a[0] is always the smallest element.
+
+Why use a d-ary heap?
+---------------------
+The height of a d-ary heap is log_d(n) instead of log_2(n). Sift up only
+compares a node to its parent, so it becomes cheaper by a factor of log_2(d).
+Sift down must find the smallest of up to d children at every level, so it
+costs d - 1 comparisons per level, but there are fewer levels. The children of
+a node are also adjacent in the array, so on large heaps, a sift down touches
+one contiguous run of d slots per level instead of log_2(d) scattered ones. In
+practice, d=4 is a good default, as the number of comparisons is about the same
+as a binary heap (3 per level over half as many levels), while insertions and
+memory locality improve.
+
+Heapify (heapification)
+-----------------------
+Bottom-up heapification works exactly as it does for a binary heap. Starting
+with the first non-leaf node (i.e., the parent of the last element in the
+array), nodes are sifted down the heap until they satisfy the heap invariant.
+"""
+
+from .heap import T
+
+# The default number of children per node.
+D = 4
+
+
+def insert(heap: list[T], e: T, d: int = D) -> None:
+    """
+    Insert an element into the heap and reestablish the heap invariant.
+
+    The insert operation appends an element to the end of the heap, then sifts
+    it up to its correct position. It has a worst-case time complexity of
+    O(log_d n).
+    """
+    heap.append(e)
+    _sift_up(heap=heap, i=len(heap) - 1, d=d)
+
+
+def delete_min(heap: list[T], d: int = D) -> T:
+    """
+    Remove the smallest element from the heap and reestablish the heap
+    invariant.
+
+    As with a binary heap, the last element is removed from the array and
+    written over the root, and the new root is sifted down to its proper
+    position in the heap. It has a worst-case time complexity of O(d log_d n).
+    """
+    last = heap.pop()  # Raises IndexError if heap is empty.
+    if not heap:
+        return last
+    _min, heap[0] = heap[0], last
+    _sift_down(heap, 0, d)
+    return _min
+
+
+def replace_min(heap: list[T], e: T, d: int = D) -> T:
+    """
+    Remove the smallest element from the heap and reestablish the heap
+    invariant using the new element e.
+    """
+    _min, heap[0] = heap[0], e  # Raises IndexError if heap is empty.
+    _sift_down(heap, 0, d)
+    return _min
+
+
+def make_heap(heap: list[T], d: int = D) -> None:
+    """
+    Build a d-ary min-heap from an array.
+
+    Starting with the first non-leaf node (i.e., the parent of the last
+    element in the array), nodes are sifted down the heap until they satisfy
+    the heap invariant.
+    """
+    n = len(heap)
+    # The parent of the last element (n - 1) is given by (n-2) // d. Since the
+    # `range` function is exclusive, (n-2) // d + 1 is used instead.
+    for i in reversed(range(_parent(n - 1, d) + 1)):
+        _sift_down(heap, i, d)
+
+
+def _sift_down(heap: list[T], i: int, d: int = D) -> None:
+    """
+    Sift down the element at index i to its correct position in the heap.
+
+    The node is compared to the smallest of its (up to) d children. If the
+    smallest child is less than the node, the child is moved up and the
+    process is repeated for the subtree rooted at the child. As in `heap.py`,
+    the node is held aside while children are moved up into the vacated slot,
+    and it is written once its position is known.
+    """
+    n = len(heap)
+    if _is_leaf(i, n, d):
+        return
+    e = heap[i]
+    # Every node before index (n-1) // d has all d children, so the loop does
+    # not need to check whether each child exists. At most one node in the
+    # heap (the parent of the last element) has fewer than d children, which
+    # is handled once after the loop.
+    full = (n - 1) // d
+    while i < full:
+        child = _first_child(i, d)
+        # Find the smallest of the children of i, which are stored next to
+        # each other in the array.
+        smallest = child
+        for c in range(child + 1, child + d):
+            if heap[c] < heap[smallest]:
+                smallest = c
+        if heap[smallest] < e:
+            heap[i] = heap[smallest]
+            i = smallest
+        else:
+            heap[i] = e
+            return
+    child = _first_child(i, d)
+    if child < n:
+        smallest = child
+        for c in range(child + 1, n):
+            if heap[c] < heap[smallest]:
+                smallest = c
+        if heap[smallest] < e:
+            heap[i] = heap[smallest]
+            i = smallest
+    heap[i] = e
+
+
+def _sift_up(heap: list[T], i: int, d: int = D) -> None:
+    """
+    Sift up the element at index i to its correct position in the heap.
+
+    The node is compared to its parent. If the node is less than its parent,
+    the parent is moved down and the process is repeated until the node is
+    greater than or equal to its parent or is the root node.
+    """
+    e = heap[i]
+    while i > 0:
+        parent = _parent(i, d)
+        if e < heap[parent]:
+            heap[i] = heap[parent]
+            i = parent
+        else:
+            break
+    heap[i] = e
+
+
+def _first_child(i: int, d: int = D) -> int:
+    """
+    The first child of a node at index i in zero-based array is given by
+    d*i+1. The remaining children follow it.
+    """
+    return d * i + 1
+
+
+def _parent(i: int, d: int = D) -> int:
+    """
+    The parent of a node at index i in zero-based array is given by
+    (i-1) // d.
+    """
+    return (i - 1) // d
+
+
+def _is_leaf(i: int, n: int, d: int = D) -> bool:
+    """
+    A node at index i is a leaf node if its first child (d*i+1) is outside of
+    an array of length n.
+    """
+    return d * i + 1 >= n
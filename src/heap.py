@@ -15,6 +15,13 @@ Formally, a heap is an array for which a[i] <= a[2*i+1] and a[i] <= a[2*i+2]
 for all i for zero-based arrays. a[0] is always the smallest element (or
 largest for max-heaps).
 
+The functions in this module only index, append to and pop from the array, so
+any mutable sequence can be used. For integers or floats, `array.array` (e.g.,
+`array.array('q')`) stores the values themselves rather than pointers to
+Python objects, which takes roughly a quarter of the memory of a list. This is
+a space optimization only, since every value read from the array is converted
+to a Python object again.
+
 Sift down vs. sift up
 ---------------------
 An implementation of a heap requires two critical operations: sift down and
@@ -62,10 +69,17 @@ The kth smallest (or largest) problem can be efficiently solved using a
 max-heap (or min-heap). Maintaining a heap of size k, the kth smallest value is
 always the root of the max-heap. To retrieve all k smallest elements, simply
 return the sorted heap.
+
+However, this takes O(nlog k) time, which approaches O(nlog n) when k is not
+small. To find only the kth smallest value, quickselect, which partitions the
+array around a pivot like quicksort but only recurses into one side, takes
+O(n) time on average.
 """
 
+import heapq
+import itertools
 from collections.abc import Iterable, Iterator
-from typing import Protocol, TypeVar
+from typing import Any, Protocol, TypeVar
 
 
 class Comparable(Protocol):
@@ -120,13 +134,19 @@ def delete_min(heap: list[T]) -> T:
     floats down the new root to its proper position in the heap (O(log n). The
     resulting operation has a time complexity of O(log n).
 
+    In practice, the swap is unnecessary. The last element is removed from the
+    array first and then written over the root, which is saved beforehand. If
+    the heap held only one element, the last element is the root, so it is
+    simply returned.
+
     NOTE: If we were to repeat the delete-min operation for all elements in the
     heap, the sequence of removed elements would yield a sorted array. This is
     the basis for the heapsort algorithm.
     """
-    i = len(heap) - 1
-    heap[0], heap[i] = heap[i], heap[0]  # Raises IndexError if heap is empty.
-    _min = heap.pop()
+    last = heap.pop()  # Raises IndexError if heap is empty.
+    if not heap:
+        return last
+    _min, heap[0] = heap[0], last
     _sift_down(heap, 0)
     return _min
 
@@ -135,11 +155,12 @@ def delete_max(heap: list[T]) -> T:
     """
     Same as `delete_min()`, but for a max-heap.
     """
-    i = len(heap) - 1
-    heap[0], heap[i] = heap[i], heap[0]  # Raises IndexError if heap is empty.
-    _min = heap.pop()
+    last = heap.pop()  # Raises IndexError if heap is empty.
+    if not heap:
+        return last
+    _max, heap[0] = heap[0], last
     _sift_down_max(heap, 0)
-    return _min
+    return _max
 
 
 def replace_min(heap: list[T], e: T) -> T:
@@ -194,40 +215,55 @@ def _sift_down(heap: list[T], i: int) -> None:
     """
     Sift down the element at index i to its correct position in the heap.
 
-    The sift down function moves node i to a position that satisfies the heap
-    property by satisfying one of three cases:
+    The textbook sift down compares node i to both of its children at each
+    level and stops as soon as node i is smaller than both (two comparisons
+    per level). Instead, Floyd's bottom-up variant is used, which mirrors the
+    `_siftup` function from the original heapq implementation:
 
-      1. The node has no children (i.e., it is a leaf node).
-      2. The node is less than either its children.
-      3. The node is greater than the smallest child and the nodes are
-         exchanged.
+      1. Repeatedly move the smallest child of node i up into its place until
+         a leaf is reached, ignoring the value of node i entirely (one
+         comparison per level).
+      2. Sift the node back up to its correct position, stopping at the
+         original index.
 
-    The third case may violate the heap property for subtree for which the node
-    is now the root. Therefore, the sift down operation is repeated.
+    Since the node being sifted down is usually the last element of the heap
+    (see `delete_min()`), it is likely to belong near the bottom. Therefore,
+    step 2 rarely moves it more than a level or two and the total number of
+    comparisons is close to log(n) instead of 2*log(n).
+
+    Rather than swapping nodes at every level, the node being sifted is held
+    aside and the vacated slot (or "hole") is moved down the heap. Each level
+    then costs a single write, and the node is written once at the end.
     """
     n = len(heap)
-    # Keep swapping the parent node with its smallest child until it is the
-    # smallest of its children or is a leaf node.
-    while True:
-        # If the node has no children (i.e., it is a leaf node), it cannot be
-        # sifted down any further.
-        if _is_leaf(i, n):
-            break
-        left, right = _left_child(i), _right_child(i)
-        # To establish the min-heap property at i, up to three nodes must be
-        # compared (the root and one or both of its children). The smallest is
-        # swapped with i. If i is the smallest node, the heap invariant is
-        # satisfied and no swap occurs.
-        smallest = i
-        if left < n and heap[left] < heap[smallest]:
-            smallest = left
-        if right < n and heap[right] < heap[smallest]:
-            smallest = right
-        if smallest != i:
-            heap[i], heap[smallest] = heap[smallest], heap[i]
-            i = smallest
-        else:
-            break
+    # If the node has no children (i.e., it is a leaf node or the heap is
+    # empty), it cannot be sifted down any further.
+    if i >= n >> 1:
+        return
+    start = i
+    e = heap[i]
+    # Move the smaller child up into the hole until hitting a leaf. Every node
+    # before index (n-1)//2 has both children, so the loop does not need to
+    # check whether the right child exists and picks the smaller child with a
+    # single comparison. At most one node in the heap (the parent of the last
+    # element when n is even) has only a left child, which is handled once
+    # after the loop.
+    last = (n - 1) >> 1
+    while i < last:
+        left = 2 * i + 1
+        right = left + 1
+        smallest = right if heap[right] < heap[left] else left
+        heap[i] = heap[smallest]
+        i = smallest
+    left = 2 * i + 1
+    if left == n - 1:
+        heap[i] = heap[left]
+        i = left
+    # The hole is now at a leaf. Place the original node there and sift it up
+    # to its final resting place, which is never above the index it started
+    # from.
+    heap[i] = e
+    _sift_up(heap=heap, i=i, start=start)
 
 
 def _sift_down_max(heap: list[T], i: int) -> None:
@@ -235,67 +271,80 @@ def _sift_down_max(heap: list[T], i: int) -> None:
     Same as `_sift_down()`, but for a max-heap.
     """
     n = len(heap)
-    while True:
-        if _is_leaf(i, n):
-            break
-        left, right = _left_child(i), _right_child(i)
-        largest = i
-        if left < n and heap[left] > heap[largest]:
-            largest = left
-        if right < n and heap[right] > heap[largest]:
-            largest = right
-        if largest != i:
-            heap[i], heap[largest] = heap[largest], heap[i]
-            i = largest
-        else:
-            break
-
-
-def _sift_up(heap: list[T], i: int) -> None:
+    if i >= n >> 1:
+        return
+    start = i
+    e = heap[i]
+    last = (n - 1) >> 1
+    while i < last:
+        left = 2 * i + 1
+        right = left + 1
+        largest = right if heap[right] > heap[left] else left
+        heap[i] = heap[largest]
+        i = largest
+    left = 2 * i + 1
+    if left == n - 1:
+        heap[i] = heap[left]
+        i = left
+    heap[i] = e
+    _sift_up_max(heap=heap, i=i, start=start)
+
+
+def _sift_up(heap: list[T], i: int, start: int = 0) -> None:
     """
     Sift up the element at index i to its correct position in the heap.
 
     The sift up function moves node i to a position that satisfies the heap
     property by satisfying one of three cases:
 
-      1. The node has no parent (i.e., it is the root node).
+      1. The node has no parent (i.e., it is the root node) or it has reached
+         index `start`.
       2. The node is greater than or equal to its parent.
-      3. The node is less than its parent and the nodes are exchanged.
+      3. The node is less than its parent and the parent is moved down.
 
     The third case may violate the heap property for subtree for which the node
-    is now a child. Therefore the sift up operation is repeated.
-    """
-    # Keep swapping the child node with its parent until it is greater than its
-    # parent or is the root node.
-    while True:
-        # If the node has no parent (i.e., it is the root node), it cannot be
-        # sifted up any further.
-        if i == 0:
-            break
-        parent = _parent(i)
-        # To establish the min-heap property at i, the child node is compared
-        # to its parent. If the child is less than its parent, the two nodes
-        # are swapped. If i is greater than its parent, no swap occurs.
-        if heap[i] < heap[parent]:
-            heap[i], heap[parent] = heap[parent], heap[i]
+    is now a child. Therefore the sift up operation is repeated. As with
+    `_sift_down()`, the node is held aside while its ancestors are moved down
+    into the hole, and it is written once its position is known.
+    """
+    e = heap[i]
+    # Keep moving the parent node down until the node is greater than its
+    # parent or is the root node. If the node has reached `start`, it cannot
+    # be sifted up any further either, which is used by `_sift_down()` to sift
+    # up only within the subtree rooted at `start`.
+    while i > start:
+        parent = (i - 1) >> 1
+        # To establish the min-heap property at i, the node is compared to the
+        # parent of the hole. If the node is less than the parent, the parent
+        # is moved down into the hole. Otherwise, the hole is its position.
+        if e < heap[parent]:
+            heap[i] = heap[parent]
             i = parent
         else:
             break
+    heap[i] = e
 
 
-def _sift_up_max(heap: list[T], i: int) -> None:
+def _sift_up_max(heap: list[T], i: int, start: int = 0) -> None:
     """
     Same as `_sift_up()`, but for a max-heap.
     """
-    while True:
-        if i == 0:
-            break
-        parent = _parent(i)
-        if heap[i] > heap[parent]:
-            heap[i], heap[parent] = heap[parent], heap[i]
+    e = heap[i]
+    while i > start:
+        parent = (i - 1) >> 1
+        if e > heap[parent]:
+            heap[i] = heap[parent]
             i = parent
         else:
             break
+    heap[i] = e
+
+
+# The index arithmetic of the helpers below is written out directly in the sift
+# functions and in `k_way_merge()`, since a function call costs more than the
+# arithmetic itself. Division by two is written as a right shift, which is
+# equivalent for the non-negative values involved. The helpers are kept to
+# document the arithmetic.
 
 
 def _left_child(i: int) -> int:
@@ -339,36 +388,146 @@ def k_way_merge(*iterables: Iterable[T]) -> Iterator[T]:
     # is a very elegant solution, which I stole from the original heapq
     # implementation. Basically, a node in the heap contains its value and its
     # next value, similar to a linked list. Each node has an additional "index"
-    # that associates it with an iterable. This is required to resolve tuple
-    # comparisons where the values of nodes are the same. When Python compares
-    # tuples, it compares elements in order until it finds a difference. Using
-    # an index, a node from a list with a lower index will take precedence over
-    # a node with a higher index.
-    heap: list[tuple[T, int, Iterator[T]]] = []
+    # that associates it with an iterable. This is required to resolve
+    # comparisons where the values of nodes are the same. Using an index, a
+    # node from a list with a lower index will take precedence over a node
+    # with a higher index. Nodes are lists rather than tuples, so that the
+    # value can be replaced in place instead of creating a new node for every
+    # element.
+    #
+    # There is at most one node per list, so the heap is allocated up front
+    # and filled by index, then trimmed to the number of non-empty lists.
+    heap: list[Any] = [None] * len(iterables)
+    n = 0
     for i, it in enumerate(map(iter, iterables)):
         try:
-            e = next(it)
-            heap.append((e, i, it))
+            heap[n] = [next(it), i, it]
+            n += 1
         except StopIteration:
             pass
-    heapify(heap)
+    del heap[n:]
+    for i in reversed(range(n >> 1)):
+        _sift_down_nodes(heap, i)
 
     # For each selection, we retrieve the smallest element from the heap
     # (heap[0]), which contains a value and an iterator. The value is yielded,
     # and a new value is retrieved from the iterator with a call to `next()`.
-    # The root node is removed from the heap and replaced with the next element
-    # from the list from which the node was taken. If `next()` raises a
-    # StopIteration exception, the iterator has been exhausted meaning the
-    # previous element was the final element from the iterable. If this is the
-    # case, we simply delete the smallest element from the heap.
+    # The value of the root node is replaced with the next element from the
+    # list from which the node was taken. If `next()` raises a StopIteration
+    # exception, the iterator has been exhausted meaning the previous element
+    # was the final element from the iterable. If this is the case, we simply
+    # delete the root node by replacing it with the last node in the heap.
+    #
+    # Either way, the root is then sifted down. Rather than calling
+    # `replace_min()`, the sift down is written out here, which saves a
+    # function call per element. Nodes are compared by value and index as in
+    # `_sift_down_nodes()`, which is also used to build the heap.
+    #
+    # The index of the smallest child of the root (`winner`) is also carried
+    # from one selection to the next. If the new root does not need to move,
+    # the children of the root are left untouched, so the next selection can
+    # skip comparing them. This is common, since runs of consecutive elements
+    # are often taken from the same list.
+    winner = -1
     while heap:
+        top = heap[0]
+        yield top[0]
         try:
-            e, i, it = heap[0]
-            yield e
-            e = next(it)
-            replace_min(heap, (e, i, it))
+            top[0] = next(top[2])
         except StopIteration:
-            delete_min(heap)
+            top = heap.pop()
+            if not heap:
+                break
+            heap[0] = top
+            winner = -1
+        n = len(heap)
+        if n == 1:
+            continue
+        e, i = top[0], top[1]
+        # Find the smallest child of the root, unless it is already known.
+        if winner < 0:
+            winner = 1
+            if n > 2:
+                left, right = heap[1], heap[2]
+                if right[0] < left[0] or (
+                    not left[0] < right[0] and right[1] < left[1]
+                ):
+                    winner = 2
+        # If the root precedes its smallest child, the heap invariant holds.
+        child = heap[winner]
+        if not (child[0] < e or (not e < child[0] and child[1] < i)):
+            continue
+        # Otherwise, the smallest child replaces the root and the root is
+        # sifted down the subtree rooted at that child. This is the same as
+        # `_sift_down_nodes()`, written out to save a function call.
+        heap[0] = child
+        pos = start = winner
+        winner = -1
+        last = (n - 1) >> 1
+        while pos < last:
+            left = 2 * pos + 1
+            l, r = heap[left], heap[left + 1]
+            if r[0] < l[0] or (not l[0] < r[0] and r[1] < l[1]):
+                heap[pos] = r
+                pos = left + 1
+            else:
+                heap[pos] = l
+                pos = left
+        left = 2 * pos + 1
+        if left == n - 1:
+            heap[pos] = heap[left]
+            pos = left
+        while pos > start:
+            parent = (pos - 1) >> 1
+            p = heap[parent]
+            if e < p[0] or (not p[0] < e and i < p[1]):
+                heap[pos] = p
+                pos = parent
+            else:
+                break
+        heap[pos] = top
+
+
+def _sift_down_nodes(heap: list[list[Any]], i: int) -> None:
+    """
+    Same as `_sift_down()`, but for the [value, index, iterator] nodes of
+    `k_way_merge()`.
+
+    A node a precedes a node b if a[0] < b[0], or if neither value is less
+    than the other and a[1] < b[1]. Comparing nodes this way, rather than
+    with list comparison, only requires the values to support `<`. List
+    comparison checks values for equality first, so values that do not
+    define `__eq__` would never fall back to the index.
+    """
+    n = len(heap)
+    if i >= n >> 1:
+        return
+    start = i
+    node = heap[i]
+    e, index = node[0], node[1]
+    last = (n - 1) >> 1
+    while i < last:
+        left = 2 * i + 1
+        l, r = heap[left], heap[left + 1]
+        if r[0] < l[0] or (not l[0] < r[0] and r[1] < l[1]):
+            heap[i] = r
+            i = left + 1
+        else:
+            heap[i] = l
+            i = left
+    left = 2 * i + 1
+    if left == n - 1:
+        heap[i] = heap[left]
+        i = left
+    while i > start:
+        parent = (i - 1) >> 1
+        p = heap[parent]
+        if e < p[0] or (not p[0] < e and index < p[1]):
+            heap[i] = p
+            i = parent
+        else:
+            break
+    heap[i] = node
 
 
 def kth_smallest(l: list[T], k: int) -> T:
@@ -377,32 +536,125 @@ def kth_smallest(l: list[T], k: int) -> T:
     max-heap (or min-heap). Maintaining a heap of size k, the kth smallest
     value is always the root of the max-heap. For all k smallest elements,
     simply return the sorted heap.
+
+    Which approach is fastest depends on k. For k = 1 (or k = n), the answer
+    is simply the smallest (or largest) value. When k is small (or close to
+    n), the heap stays small and `heapq.nsmallest()` (or `heapq.nlargest()`)
+    is used, since its heap operations are implemented in C. Otherwise, the
+    heap grows to O(n) and quickselect, which runs in O(n) expected time, is
+    used instead. See `kth_smallest_py()` for the pure-Python heap
+    implementation.
+    """
+    n = len(l)
+    if not 1 <= k <= n:
+        raise IndexError("k is out of range")
+    if k == 1:
+        return min(l)
+    if k == n:
+        return max(l)
+    # The heap is faster than quickselect for up to about n/16 elements, as
+    # measured for lists of integers.
+    if k <= 64 or k < n // 16:
+        return heapq.nsmallest(k, l)[-1]
+    m = n - k + 1
+    if m <= 64 or m < n // 16:
+        return heapq.nlargest(m, l)[-1]
+    return _quickselect(list(l), k - 1)
+
+
+def kth_largest(l: list[T], k: int) -> T:
     """
+    Same as `kth_smallest()`, but for the kth largest value.
+    """
+    # The kth largest value is the (n-k+1)th smallest value.
+    return kth_smallest(l, len(l) - k + 1)
+
+
+def kth_smallest_py(l: list[T], k: int) -> T:
+    """
+    Same as `kth_smallest()`, but implemented using the heap operations from
+    this module.
+    """
+    if not 1 <= k <= len(l):
+        raise IndexError("k is out of range")
     # Build a heap from the first k elements of the list.
-    heap: list[T] = []
-    for i in range(k):
-        heap.append(l[i])
+    heap: list[T] = list(itertools.islice(l, k))
     heapify_max(heap)
     # Iterate over the remaining values in the list. If a value is less than
-    # the largest value in the heap, replace it.
-    for i in range(k, len(l)):
-        if l[i] < heap[0]:
-            replace_max(heap, l[i])
-    return heap[0]
+    # the largest value in the heap, replace it. Every value is compared to
+    # the root, but only a few replace it, so the root is kept in a local
+    # variable and only read from the heap again after a replacement.
+    top = heap[0]
+    for e in itertools.islice(l, k, None):
+        if e < top:
+            replace_max(heap, e)
+            top = heap[0]
+    return top
 
 
-def kth_largest(l: list[T], k: int) -> T:
+def kth_largest_py(l: list[T], k: int) -> T:
     """
-    Same as `kth_smallest()`, but for the kth largest value.
+    Same as `kth_smallest_py()`, but for the kth largest value.
     """
-    heap: list[T] = []
-    for i in range(k):
-        heap.append(l[i])
+    if not 1 <= k <= len(l):
+        raise IndexError("k is out of range")
+    heap: list[T] = list(itertools.islice(l, k))
     heapify(heap)
-    for i in range(k, len(l)):
-        if l[i] > heap[0]:
-            replace_min(heap, l[i])
-    return heap[0]
+    top = heap[0]
+    for e in itertools.islice(l, k, None):
+        if e > top:
+            replace_min(heap, e)
+            top = heap[0]
+    return top
+
+
+def _quickselect(a: list[T], k: int) -> T:
+    """
+    Return the kth smallest value (zero-based) of array a, which is reordered
+    in place.
+
+    Quickselect is the selection counterpart of quicksort. The array is
+    partitioned around a pivot, but only the side that contains index k is
+    partitioned further, which takes O(n) time on average. The pivot is the
+    median of the first, middle and last values, which avoids the O(n^2)
+    worst case on sorted or reverse-sorted input.
+
+    A three-way partition is used, splitting the array into values less
+    than, equal to and greater than the pivot. If index k falls within the
+    values equal to the pivot, the pivot is the answer. Otherwise, many equal
+    values (e.g., an array of a single repeated value) would degrade a
+    two-way partition to O(n^2).
+    """
+    lo, hi = 0, len(a) - 1
+    while lo < hi:
+        # Find the median of a[lo], a[mid] and a[hi].
+        x, y, z = a[lo], a[(lo + hi) // 2], a[hi]
+        if y < x:
+            x, y = y, x
+        if z < y:
+            y = max(x, z)
+        pivot = y
+        # Partition a[lo:hi+1] such that a[lo:lt] < pivot, a[lt:i] == pivot
+        # and a[gt+1:hi+1] > pivot, until i passes gt.
+        lt, i, gt = lo, lo, hi
+        while i <= gt:
+            e = a[i]
+            if e < pivot:
+                a[lt], a[i] = e, a[lt]
+                lt += 1
+                i += 1
+            elif pivot < e:
+                a[i], a[gt] = a[gt], e
+                gt -= 1
+            else:
+                i += 1
+        if k < lt:
+            hi = lt - 1
+        elif k > gt:
+            lo = gt + 1
+        else:
+            return pivot
+    return a[k]
 
 
 # Though the technical names for heap operation are insert, delete-min,
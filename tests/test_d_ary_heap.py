@@ -0,0 +1,101 @@
+"""
+d-ary Heap
+----------
+"""
+
+import random
+from unittest import TestCase
+
+from src import d_ary_heap
+from tests.test_heap import create_random_array
+
+
+class TestDAryHeap(TestCase):
+    def setUp(self):
+        self.x = random.randint(1, 10)
+        self.n = random.randint(1, 1000)
+        self.a = random.randint(-1000, 0)
+        self.b = random.randint(0, 1000)
+        self.d = random.randint(2, 8)
+
+    def test_insert(self):
+        """
+        Test 'insert' operation.
+        """
+        for _ in range(self.x):
+            h = []
+            for e in create_random_array(n=self.n, a=self.a, b=self.b):
+                d_ary_heap.insert(h, e, d=self.d)
+
+            assert is_heap(h, d=self.d)
+
+    def test_delete_min(self):
+        """
+        Test 'delete-min' operation.
+        """
+        for _ in range(self.x):
+            h = create_random_array(n=self.n, a=self.a, b=self.b)
+            exp = sorted(h)
+            d_ary_heap.make_heap(h, d=self.d)
+
+            # Deleting every element from the heap yields a sorted array.
+            act = [d_ary_heap.delete_min(h, d=self.d) for _ in range(len(h))]
+
+            assert act == exp
+
+    def test_replace_min(self):
+        """
+        Test 'replace-min' operation.
+        """
+        for _ in range(self.x):
+            h = create_random_array(n=self.n, a=self.a, b=self.b)
+            exp_min = min(h)
+            d_ary_heap.make_heap(h, d=self.d)
+
+            # Replace the smallest element from the heap with new element e.
+            e = random.randint(-1000, 1000)
+            act_min = d_ary_heap.replace_min(h, e, d=self.d)
+
+            assert act_min == exp_min
+            assert is_heap(h, d=self.d)
+
+    def test_make_heap(self):
+        """
+        Test 'make-heap' operation.
+        """
+        for _ in range(self.x):
+            h = create_random_array(n=self.n, a=self.a, b=self.b)
+            d_ary_heap.make_heap(h, d=self.d)
+
+            assert is_heap(h, d=self.d)
+
+    def test_default_d(self):
+        """
+        Test operations with the default number of children per node.
+        """
+        for _ in range(self.x):
+            h = create_random_array(n=self.n, a=self.a, b=self.b)
+            exp = sorted(h)
+            d_ary_heap.make_heap(h)
+
+            assert is_heap(h, d=d_ary_heap.D)
+
+            e = random.randint(-1000, 1000)
+            d_ary_heap.insert(h, e)
+            exp = sorted([*exp, e])
+
+            assert is_heap(h, d=d_ary_heap.D)
+
+            act = [d_ary_heap.delete_min(h) for _ in range(len(h))]
+
+            assert act == exp
+
+
+def is_heap(heap: list[int], d: int) -> bool:
+    """
+    Returns true if the given heap is a valid d-ary min-heap.
+
+    A d-ary heap is an array for which a[i] <= a[d*i+j] for all i and
+    1 <= j <= d for zero-based arrays. a[0] is always the smallest element.
+    """
+    return all(heap[(i - 1) // d] <= heap[i] for i in range(1, len(heap)))
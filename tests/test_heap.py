@@ -3,6 +3,7 @@ Heap
 ----
 """
 
+import array
 import itertools
 import random
 from unittest import TestCase
@@ -29,7 +30,21 @@ class TestHeap(TestCase):
             e = random.randint(-1000, 1000)
             heap.insert(h, e)
 
-        assert is_heap(h)
+            assert is_heap(h)
+
+    def test_insert_max(self):
+        """
+        Test 'insert' operation for a max-heap.
+        """
+        for _ in range(self.x):
+            h = create_random_array(n=self.n, a=self.a, b=self.b)
+            heap.heapify_max(h)
+
+            # Insert a random element into the heap.
+            e = random.randint(-1000, 1000)
+            heap.insert_max(h, e)
+
+            assert is_heap_max(h)
 
     def test_delete_min(self):
         """
@@ -46,6 +61,27 @@ class TestHeap(TestCase):
             assert act_min == exp_min
             assert is_heap(h)
 
+    def test_delete_max(self):
+        """
+        Test 'delete-max' operation.
+        """
+        for _ in range(self.x):
+            h = create_random_array(n=self.n, a=self.a, b=self.b)
+            exp = sorted(h, reverse=True)
+            heap.heapify_max(h)
+
+            # Delete the largest element from the heap.
+            act_max = heap.delete_max(h)
+
+            assert act_max == exp[0]
+            assert is_heap_max(h)
+
+            # Deleting every element from the heap yields a reverse-sorted
+            # array.
+            act = [act_max] + [heap.delete_max(h) for _ in range(len(h))]
+
+            assert act == exp
+
     def test_replace_min(self):
         """
         Test 'replace-min' operation.
@@ -72,6 +108,25 @@ class TestHeap(TestCase):
 
             assert is_heap(h)
 
+    def test_array(self):
+        """
+        Test heap operations on an 'array.array'.
+        """
+        for _ in range(self.x):
+            h = array.array("q", create_random_array(n=self.n, a=self.a, b=self.b))
+            exp = sorted(h)
+            heap.heapify(h)
+
+            assert is_heap(h)
+
+            k = random.randint(1, self.n)
+            assert heap.kth_smallest(l=h, k=k) == exp[k - 1]
+
+            # Deleting every element from the heap yields a sorted array.
+            act = [heap.delete_min(h) for _ in range(len(h))]
+
+            assert act == exp
+
     def test_k_way_merge(self):
         """
         Test k-way merge algorithm.
@@ -83,6 +138,25 @@ class TestHeap(TestCase):
 
             assert list(heap.k_way_merge(*iterables)) == exp
 
+            # Equal elements are taken in the order of the lists they came
+            # from, even if the elements only define '__lt__'. Python's sort
+            # is stable, so sorting the concatenated lists gives that order.
+            iterables = [
+                [Key(e, tag=(i, j)) for j, e in enumerate(it)]
+                for i, it in enumerate(create_k_sorted_arrays(k=k, a=-10, b=10))
+            ]
+            exp = sorted(itertools.chain(*iterables), key=lambda key: key.e)
+
+            act = heap.k_way_merge(*iterables)
+            assert [key.tag for key in act] == [key.tag for key in exp]
+
+            # Runs of consecutive elements from the same list, which leave the
+            # root of the heap in place.
+            runs = [list(range(j * 10, j * 10 + 10)) for j in range(k)]
+            random.shuffle(runs)
+
+            assert list(heap.k_way_merge(*runs)) == list(range(k * 10))
+
     def test_kth_smallest(self):
         """
         Test kth_smallest solution.
@@ -94,9 +168,64 @@ class TestHeap(TestCase):
             self.n = 1000
             k = random.randint(1, self.n)
             l = create_random_array(n=self.n, a=self.a, b=self.b)
-            exp = sorted(l.copy())[k - 1]
+            exp = sorted(l)[k - 1]
 
             assert heap.kth_smallest(l=l, k=k) == exp
+            assert heap.kth_smallest_py(l=l, k=k) == exp
+
+        # Any sequence can be used, not only lists. k = n//2 is chosen so that
+        # quickselect is used, which works on a copy of the sequence.
+        k = self.n // 2
+        exp = sorted(l)[k - 1]
+        assert heap.kth_smallest(l=tuple(l), k=k) == exp
+        assert heap.kth_smallest(l=range(self.n), k=k) == k - 1
+        assert heap.kth_smallest_py(l=tuple(l), k=k) == exp
+
+        # k must be within the range of 'l' [1:self.n], inclusive.
+        for k in (0, self.n + 1):
+            with self.assertRaises(IndexError):
+                heap.kth_smallest(l=l, k=k)
+            with self.assertRaises(IndexError):
+                heap.kth_smallest_py(l=l, k=k)
+
+    def test_kth_largest(self):
+        """
+        Test kth_largest solution.
+        """
+        for _ in range(self.x):
+            self.n = 1000
+            k = random.randint(1, self.n)
+            l = create_random_array(n=self.n, a=self.a, b=self.b)
+            exp = sorted(l, reverse=True)[k - 1]
+
+            assert heap.kth_largest(l=l, k=k) == exp
+            assert heap.kth_largest_py(l=l, k=k) == exp
+
+        # Any sequence can be used, not only lists.
+        k = self.n // 2
+        exp = sorted(l, reverse=True)[k - 1]
+        assert heap.kth_largest(l=tuple(l), k=k) == exp
+        assert heap.kth_largest_py(l=tuple(l), k=k) == exp
+
+        # k must be within the range of 'l' [1:self.n], inclusive.
+        for k in (0, self.n + 1):
+            with self.assertRaises(IndexError):
+                heap.kth_largest(l=l, k=k)
+            with self.assertRaises(IndexError):
+                heap.kth_largest_py(l=l, k=k)
+
+
+class Key:
+    """
+    An element that only defines '__lt__', as required by 'heap.Comparable'.
+    """
+
+    def __init__(self, e: int, tag: tuple[int, int]):
+        self.e = e
+        self.tag = tag
+
+    def __lt__(self, other: "Key") -> bool:
+        return self.e < other.e
 
 
 def create_random_array(n: int, a: int, b: int) -> list[int]:
@@ -104,7 +233,7 @@ def create_random_array(n: int, a: int, b: int) -> list[int]:
     Creates a random array of size `n` with integers between `a` and `b`, both
     inclusive.
     """
-    return [random.randint(a, b) for _ in range(n)]
+    return random.choices(range(a, b + 1), k=n)
 
 
 def create_sorted_array(n: int, a: int, b: int) -> list[int]:
@@ -112,7 +241,7 @@ def create_sorted_array(n: int, a: int, b: int) -> list[int]:
     Creates a sorted array of size `n` with integers between `a` and `b`, both
     inclusive.
     """
-    return sorted([random.randint(a, b) for _ in range(n)])
+    return sorted(create_random_array(n=n, a=a, b=b))
 
 
 def create_k_sorted_arrays(k: int, a: int, b: int) -> list[list[int]]:
@@ -139,3 +268,20 @@ def is_heap(heap: list[int]) -> bool:
         if right < n and heap[i] > heap[right]:
             return False
     return True
+
+
+def is_heap_max(heap: list[int]) -> bool:
+    """
+    Returns true if the given heap is a valid max-heap.
+
+    A max-heap is an array for which a[i] >= a[2*i+1] and a[i] >= a[2*i+2] for
+    all i for zero-based arrays. a[0] is always the largest element.
+    """
+    n = len(heap)
+    for i in reversed(range(n // 2)):
+        left, right = 2 * i + 1, 2 * i + 2
+        if left < n and heap[i] < heap[left]:
+            return False
+        if right < n and heap[i] < heap[right]:
+            return False
+    return True